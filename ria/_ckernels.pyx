@@ -0,0 +1,128 @@
+#
+# _ckernels.pyx
+#
+# Copyright (c) 2016-2017 Junpei Kawamoto
+#
+# This file is part of rgmining-ria.
+#
+# rgmining-ria is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-ria is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with rgmining-ria. If not, see <http://www.gnu.org/licenses/>.
+#
+# cython: language_level=3, boundscheck=False, wraparound=False
+# cython: cdivision=True
+"""Cython implementations of the kernels in :mod:`ria._kernels`.
+
+This extension is built by setup.py when Cython is available, and
+:mod:`ria._kernels` uses it prior to Numba. Rows are processed in parallel
+if the extension is compiled with OpenMP.
+
+Variables assigned in the body of prange loops are thread-private, and thus
+accumulators are updated by `x = x + y` instead of `x += y`, which Cython
+treats as a reduction.
+"""
+import numpy as np
+from cython cimport floating
+from cython.parallel cimport prange
+from libc.math cimport exp, fabs
+
+
+def weighted_mean(
+        const int[::1] indptr, const int[::1] indices,
+        const floating[::1] values, const floating[::1] weights):
+    """Cython implementation of :func:`ria._kernels.weighted_mean`.
+    """
+    cdef Py_ssize_t n = indptr.shape[0] - 1
+    res = np.zeros(n, dtype=np.asarray(values).dtype)
+    cdef floating[::1] out = res
+    cdef Py_ssize_t i, k
+    cdef double num, den, total, w
+    for i in prange(n, nogil=True):
+        num = 0
+        den = 0
+        total = 0
+        for k in range(indptr[i], indptr[i + 1]):
+            w = weights[indices[k]]
+            num = num + values[k] * w
+            den = den + w
+            total = total + values[k]
+        if den != 0:
+            out[i] = num / den
+        elif indptr[i + 1] > indptr[i]:
+            out[i] = total / (indptr[i + 1] - indptr[i])
+    return res
+
+
+def weighted_deviation(
+        const int[::1] indptr, const int[::1] indices,
+        const floating[::1] values, const floating[::1] centers,
+        const floating[::1] weights):
+    """Cython implementation of :func:`ria._kernels.weighted_deviation`.
+    """
+    cdef Py_ssize_t n = indptr.shape[0] - 1
+    res = np.zeros(n, dtype=np.asarray(values).dtype)
+    cdef floating[::1] out = res
+    cdef Py_ssize_t i, k
+    cdef double num, den, total, d, w
+    for i in prange(n, nogil=True):
+        num = 0
+        den = 0
+        total = 0
+        for k in range(indptr[i], indptr[i + 1]):
+            d = fabs(values[k] - centers[indices[k]])
+            w = weights[indices[k]]
+            num = num + d * w
+            den = den + w
+            total = total + d
+        if den != 0:
+            out[i] = num / den
+        elif indptr[i + 1] > indptr[i]:
+            out[i] = total / (indptr[i + 1] - indptr[i])
+    return res
+
+
+def mean_deviation(
+        const int[::1] indptr, const int[::1] indices,
+        const floating[::1] values, const floating[::1] centers):
+    """Cython implementation of :func:`ria._kernels.mean_deviation`.
+    """
+    cdef Py_ssize_t n = indptr.shape[0] - 1
+    res = np.zeros(n, dtype=np.asarray(values).dtype)
+    cdef floating[::1] out = res
+    cdef Py_ssize_t i, k
+    cdef double total
+    for i in prange(n, nogil=True):
+        total = 0
+        for k in range(indptr[i], indptr[i + 1]):
+            total = total + fabs(values[k] - centers[indices[k]])
+        if indptr[i + 1] > indptr[i]:
+            out[i] = total / (indptr[i + 1] - indptr[i])
+    return res
+
+
+def sigmoid_weights(
+        const floating[::1] scores, double mean, double sigma, double alpha):
+    """Cython implementation of :func:`ria._kernels.sigmoid_weights`.
+    """
+    cdef Py_ssize_t n = scores.shape[0]
+    res = np.empty(n, dtype=np.asarray(scores).dtype)
+    cdef floating[::1] out = res
+    cdef Py_ssize_t i
+    cdef double z, e
+    for i in prange(n, nogil=True):
+        z = alpha * (scores[i] - mean) / sigma
+        if z > 0:
+            e = exp(-z)
+            out[i] = e / (1 + e)
+        else:
+            out[i] = 1 / (1 + exp(z))
+    return res
@@ -0,0 +1,349 @@
+#
+# _kernels.py
+#
+# Copyright (c) 2016-2017 Junpei Kawamoto
+#
+# This file is part of rgmining-ria.
+#
+# rgmining-ria is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-ria is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with rgmining-ria. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Provide array kernels shared by the bipartite graph and credibilities.
+
+The bipartite graph stores its edges in compressed sparse row (CSR)
+representations, i.e. an index pointer array `indptr` and element arrays
+where elements in the i-th row are stored in `indptr[i]:indptr[i + 1]`.
+Functions in this module compute per-row values of such representations.
+
+:func:`weighted_mean` and :func:`weighted_deviation` are the kernels of
+updating summaries and anomalous scores, and :func:`sigmoid_weights` computes
+weights of reviewers. They have three implementations, which are used in
+the following order of preference:
+
+1. the Cython extension :mod:`ria._ckernels`, which is built when Cython is
+   available at installation,
+2. functions compiled by `numba <http://numba.pydata.org/>`_ if it is
+   installed,
+3. NumPy implementations.
+
+Compiled implementations read each edge once without allocating temporary
+arrays.
+"""
+from __future__ import absolute_import
+import numpy as np
+
+try:
+    from ria import _ckernels
+except ImportError:  # pragma: no cover
+    _ckernels = None
+
+try:
+    import numba
+except ImportError:  # pragma: no cover
+    numba = None
+
+
+def indptr(ids, n):
+    """Compute the index pointer array of a CSR representation.
+
+    Args:
+      ids: row indices of the elements.
+      n: the number of rows.
+
+    Returns:
+      an array of which i-th and (i+1)-th elements specify the range of
+      elements belonging to the i-th row.
+    """
+    res = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(ids, minlength=n), out=res[1:])
+    return res
+
+
+def segment_sum(values, indptr):
+    """Compute the sum of each segment of a CSR array.
+
+    Args:
+      values: element values of the CSR array.
+      indptr: the index pointer array.
+
+    Returns:
+      an array of which i-th element is the sum of values in the i-th row.
+      Empty rows have 0.
+    """
+    res = np.zeros(len(indptr) - 1, dtype=values.dtype)
+    starts = indptr[:-1]
+    nonempty = starts != indptr[1:]
+    if nonempty.any():
+        res[nonempty] = np.add.reduceat(values, starts[nonempty])
+    return res
+
+
+def segment_any(flags, indptr):
+    """Check whether each segment of a boolean CSR array has a true element.
+
+    Args:
+      flags: boolean element values of the CSR array.
+      indptr: the index pointer array.
+
+    Returns:
+      a boolean array of which i-th element is True if the i-th row has
+      at least one true element.
+    """
+    return segment_sum(flags.astype(np.int32), indptr) > 0
+
+
+def select_rows(indptr, rows):
+    """Select rows from a CSR array.
+
+    Args:
+      indptr: the index pointer array.
+      rows: sorted indices of the rows to be selected.
+
+    Returns:
+      a tuple of the index pointer array of the selected rows and
+      positions of their elements in the original element arrays.
+      The positions are a slice when all elements are selected so that
+      indexing with it doesn't copy the element arrays.
+    """
+    counts = np.diff(indptr)[rows]
+    res = np.zeros(len(rows) + 1, dtype=np.int32)
+    np.cumsum(counts, out=res[1:])
+    if res[-1] == indptr[-1]:
+        return res, slice(None)
+    return res, np.repeat(indptr[rows] - res[:-1], counts) + np.arange(
+        res[-1], dtype=np.int32)
+
+
+def _np_abs_deviation(values, centers, indices):
+    """Compute `abs(values - centers[indices])` with one temporary array.
+
+    Fancy indexing copies the gathered centers, and the differences are
+    computed in place of the copy.
+    """
+    res = centers[indices]
+    res -= values
+    return np.abs(res, out=res)
+
+
+def _np_weighted_mean(indptr, indices, values, weights):
+    """NumPy implementation of :func:`weighted_mean`.
+    """
+    w = weights[indices]
+    num = segment_sum(values * w, indptr)
+    den = segment_sum(w, indptr)
+    counts = np.maximum(np.diff(indptr), 1).astype(values.dtype)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(
+            den != 0, num / den, segment_sum(values, indptr) / counts)
+
+
+def _np_weighted_deviation(indptr, indices, values, centers, weights):
+    """NumPy implementation of :func:`weighted_deviation`.
+    """
+    return _np_weighted_mean(
+        indptr, indices, _np_abs_deviation(values, centers, indices), weights)
+
+
+def _np_mean_deviation(indptr, indices, values, centers):
+    """NumPy implementation of :func:`mean_deviation`.
+    """
+    counts = np.maximum(np.diff(indptr), 1).astype(values.dtype)
+    return segment_sum(
+        _np_abs_deviation(values, centers, indices), indptr) / counts
+
+
+def _np_sigmoid_weights(scores, mean, sigma, alpha):
+    """NumPy implementation of :func:`sigmoid_weights`.
+    """
+    z = alpha * (scores - mean) / sigma
+    # 1 / (1 + exp(z)) = exp(-log(1 + exp(z))), and np.logaddexp computes
+    # the logarithm without overflows so that large z gives 0.
+    return np.exp(-np.logaddexp(0, z))
+
+
+if numba:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _jit_weighted_mean(indptr, indices, values, weights):
+        """Numba implementation of :func:`weighted_mean`.
+        """
+        n = len(indptr) - 1
+        res = np.zeros(n, dtype=values.dtype)
+        for i in numba.prange(n):  # pylint: disable=not-an-iterable
+            num = 0.
+            den = 0.
+            total = 0.
+            for k in range(indptr[i], indptr[i + 1]):
+                w = weights[indices[k]]
+                num += values[k] * w
+                den += w
+                total += values[k]
+            if den != 0:
+                res[i] = num / den
+            elif indptr[i + 1] > indptr[i]:
+                res[i] = total / (indptr[i + 1] - indptr[i])
+        return res
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _jit_weighted_deviation(indptr, indices, values, centers, weights):
+        """Numba implementation of :func:`weighted_deviation`.
+        """
+        n = len(indptr) - 1
+        res = np.zeros(n, dtype=values.dtype)
+        for i in numba.prange(n):  # pylint: disable=not-an-iterable
+            num = 0.
+            den = 0.
+            total = 0.
+            for k in range(indptr[i], indptr[i + 1]):
+                d = abs(values[k] - centers[indices[k]])
+                w = weights[indices[k]]
+                num += d * w
+                den += w
+                total += d
+            if den != 0:
+                res[i] = num / den
+            elif indptr[i + 1] > indptr[i]:
+                res[i] = total / (indptr[i + 1] - indptr[i])
+        return res
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _jit_mean_deviation(indptr, indices, values, centers):
+        """Numba implementation of :func:`mean_deviation`.
+        """
+        n = len(indptr) - 1
+        res = np.zeros(n, dtype=values.dtype)
+        for i in numba.prange(n):  # pylint: disable=not-an-iterable
+            total = 0.
+            for k in range(indptr[i], indptr[i + 1]):
+                total += abs(values[k] - centers[indices[k]])
+            if indptr[i + 1] > indptr[i]:
+                res[i] = total / (indptr[i + 1] - indptr[i])
+        return res
+
+    # fastmath isn't used since it assumes exp doesn't overflow.
+    @numba.njit(parallel=True, cache=True)
+    def _jit_sigmoid_weights(scores, mean, sigma, alpha, res):
+        """Numba implementation of :func:`sigmoid_weights`.
+
+        The weights are stored in the given floating point array `res`, which
+        is also returned.
+        """
+        for i in numba.prange(len(scores)):  # pylint: disable=not-an-iterable
+            z = alpha * (scores[i] - mean) / sigma
+            if z > 0:
+                e = np.exp(-z)
+                res[i] = e / (1 + e)
+            else:
+                res[i] = 1 / (1 + np.exp(z))
+        return res
+
+
+def weighted_mean(indptr, indices, values, weights):
+    """Compute the weighted average of each row of a CSR array.
+
+    The weight of an element is looked up by its column index. If weights in
+    a row sum up to 0, the row's simple average is used instead.
+
+    Args:
+      indptr: the index pointer array.
+      indices: column indices of the elements.
+      values: element values of the CSR array.
+      weights: an array of weights indexed by column indices.
+
+    Returns:
+      an array of which i-th element is the weighted average of the i-th row.
+      Empty rows have 0.
+    """
+    if _ckernels:
+        return _ckernels.weighted_mean(indptr, indices, values, weights)
+    if numba:
+        return _jit_weighted_mean(indptr, indices, values, weights)
+    return _np_weighted_mean(indptr, indices, values, weights)
+
+
+def weighted_deviation(indptr, indices, values, centers, weights):
+    """Compute the weighted average absolute deviation of each row.
+
+    This function is as same as :func:`weighted_mean` but averages
+    `abs(values[k] - centers[indices[k]])` instead of `values[k]`.
+
+    Args:
+      indptr: the index pointer array.
+      indices: column indices of the elements.
+      values: element values of the CSR array.
+      centers: an array of values each element is compared with, indexed by
+        column indices.
+      weights: an array of weights indexed by column indices.
+
+    Returns:
+      an array of which i-th element is the weighted average deviation of
+      the i-th row. Empty rows have 0.
+    """
+    if _ckernels:
+        return _ckernels.weighted_deviation(
+            indptr, indices, values, centers, weights)
+    if numba:
+        return _jit_weighted_deviation(indptr, indices, values, centers, weights)
+    return _np_weighted_deviation(indptr, indices, values, centers, weights)
+
+
+def mean_deviation(indptr, indices, values, centers):
+    """Compute the average absolute deviation of each row.
+
+    This function is as same as :func:`weighted_deviation` with uniform
+    weights but doesn't read any weights.
+
+    Args:
+      indptr: the index pointer array.
+      indices: column indices of the elements.
+      values: element values of the CSR array.
+      centers: an array of values each element is compared with, indexed by
+        column indices.
+
+    Returns:
+      an array of which i-th element is the average deviation of the i-th row.
+      Empty rows have 0.
+    """
+    if _ckernels:
+        return _ckernels.mean_deviation(indptr, indices, values, centers)
+    if numba:
+        return _jit_mean_deviation(indptr, indices, values, centers)
+    return _np_mean_deviation(indptr, indices, values, centers)
+
+
+def sigmoid_weights(scores, mean, sigma, alpha):
+    """Compute weights of anomalous scores.
+
+    The weight of a score :math:`s` is
+    :math:`1 / (1 + \\exp(\\alpha (s - \\mu) / \\sigma))`,
+    which is computed without overflows so that large scores give 0.
+
+    Args:
+      scores: an array of anomalous scores. Integer scores are converted to
+        float64.
+      mean: the average :math:`\\mu` of the scores.
+      sigma: the standard deviation :math:`\\sigma` of the scores. It must not
+        be 0.
+      alpha: the parameter :math:`\\alpha`.
+
+    Returns:
+      a floating point array of weights of the given scores.
+    """
+    scores = np.asarray(scores)
+    if scores.dtype.kind != "f":
+        scores = scores.astype(np.float64)
+    if _ckernels:
+        return _ckernels.sigmoid_weights(scores, mean, sigma, alpha)
+    if numba:
+        return _jit_sigmoid_weights(
+            scores, mean, sigma, alpha, np.empty_like(scores))
+    return _np_sigmoid_weights(scores, mean, sigma, alpha)
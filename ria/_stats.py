@@ -0,0 +1,49 @@
+#
+# _stats.py
+#
+# Copyright (c) 2016-2017 Junpei Kawamoto
+#
+# This file is part of rgmining-ria.
+#
+# rgmining-ria is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-ria is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with rgmining-ria. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Provide statistics of small collections of numbers.
+
+Functions in this module are written in pure Python since calling NumPy
+functions costs more than computing statistics of a few numbers.
+Use NumPy methods for values already stored in arrays.
+"""
+from __future__ import absolute_import, division
+import math
+
+
+def mean_std(xs):
+    """Compute the average and the standard deviation of numbers.
+
+    The standard deviation is the population one as same as
+    :func:`numpy.std`.
+
+    Args:
+      xs: a sequence of numbers.
+
+    Returns:
+      a tuple of the average and the standard deviation. Both of them are 0
+      if the given sequence is empty.
+    """
+    n = len(xs)
+    if not n:
+        return 0., 0.
+    m = math.fsum(xs) / n
+    v = math.fsum((x - m) * (x - m) for x in xs) / n
+    return m, math.sqrt(v)
@@ -67,6 +67,7 @@ and two kinds of nodes, :class:`bipartite.Reviewer` and :class:`bipartite.Produc
 There are also many variations of the bipartite graph.
 """
 from __future__ import absolute_import, division
+from array import array
 import json
 from logging import getLogger
 import math
@@ -74,8 +75,17 @@ import math
 import numpy as np
 import networkx as nx
 
-from common import memoized
+from ria.credibility import UniformCredibility
 from ria.credibility import WeightedCredibility
+from ria._kernels import indptr
+from ria._kernels import mean_deviation
+from ria._kernels import segment_any
+from ria._kernels import segment_sum
+from ria._kernels import select_rows
+from ria._kernels import sigmoid_weights
+from ria._kernels import weighted_deviation
+from ria._kernels import weighted_mean
+from ria._stats import mean_std
 from review import AverageSummary
 
 
@@ -87,16 +97,18 @@ class _Node(object):
 
     Args:
       graph: parent graph instance.
-      name: name of the new node.
+      name: name of the new node. It can be a string or an integer.
 
     If the name is not given, object.__str__() will be used.
 
     This class implements __eq__, __ne__, and __hash__ for convenience.
+    They are based on the integer ID subclasses assign in their constructors,
+    which is the index of the node in the graph's node list and CSR arrays.
 
     Attributes:
       name: Name of this node.
     """
-    __slots__ = ("_graph", "name", "_hash")
+    __slots__ = ("_graph", "name", "_id")
 
     def __init__(self, graph, name=None):
         """Construct a new node.
@@ -110,24 +122,24 @@ class _Node(object):
                 "Given graph is not instance of Bipartite:", graph)
 
         self._graph = graph
-        if name:
+        if name is not None:
             self.name = name
         else:
             self.name = super(_Node, self).__str__()
-        self._hash = None
 
     def __eq__(self, other):
-        if not isinstance(other, type(self)):
-            return False
-        return self.name == other.name
+        return self is other or (
+            type(self) is type(other) and self._graph is other._graph and
+            self._id == other._id)
+
+    def __ne__(self, other):
+        return not self == other
 
     def __hash__(self):
-        if not self._hash:
-            self._hash = 13 * hash(type(self)) + 17 * hash(self.name)
-        return self._hash
+        return self._id
 
     def __str__(self):
-        return self.name
+        return str(self.name)
 
 
 class Reviewer(_Node):
@@ -144,6 +156,7 @@ class Reviewer(_Node):
 
     def __init__(self, graph, credibility, name=None, anomalous=None):
         super(Reviewer, self).__init__(graph, name)
+        self._id = len(graph.reviewers)
         self._anomalous = anomalous
         self._credibility = credibility
 
@@ -154,7 +167,7 @@ class Reviewer(_Node):
         Initial anomalous score is :math:`1 / |R|`
         where :math:`R` is a set of reviewers.
         """
-        return self._anomalous if self._anomalous else 1. / len(self._graph.reviewers)
+        return self._anomalous if self._anomalous else self._graph._inv_n_reviewers
 
     @anomalous_score.setter
     def anomalous_score(self, v):
@@ -164,6 +177,9 @@ class Reviewer(_Node):
           v: the new anomalous score.
         """
         self._anomalous = float(v)
+        if self._graph._finalized:
+            self._graph._anomalous_vec[self._id] = self.anomalous_score
+            self._graph._reset_dirty()
 
     def update_anomalous_score(self):
         """Update anomalous score.
@@ -190,21 +206,37 @@ class Reviewer(_Node):
         Returns:
           absolute difference between old anomalous score and updated one.
         """
-        products = self._graph.retrieve_products(self)
-        diffs = [
-            p.summary.difference(self._graph.retrieve_review(self, p))
-            for p in products
-        ]
+        diffs, weights = self._deviations()
 
         old = self.anomalous_score
-        try:
-            self.anomalous_score = np.average(
-                diffs, weights=list(map(self._credibility, products)))
-        except ZeroDivisionError:
-            self.anomalous_score = np.average(diffs)
+        total = weights.sum()
+        if total:
+            self.anomalous_score = diffs.dot(weights) / total
+        else:
+            self.anomalous_score = diffs.mean()
 
         return abs(self.anomalous_score - old)
 
+    def _deviations(self):
+        """Compute differences between reviews and summaries of products.
+
+        Reviews are read from the CSR arrays of the parent graph in float64,
+        and credibilities are computed by the credibility of this reviewer.
+
+        Returns:
+          a tuple of two float64 arrays; absolute differences between reviews
+          of this reviewer and summaries of the reviewed products, and
+          credibilities of those products.
+        """
+        graph = self._graph
+        indices, reviews = graph._reviewer_row(self)
+        products = [graph.products[j] for j in indices.tolist()]
+        summaries = np.array(
+            [p.summary.score for p in products], dtype=np.float64)
+        credibilities = np.array(
+            [self._credibility(p) for p in products], dtype=np.float64)
+        return np.abs(reviews - summaries), credibilities
+
 
 class Product(_Node):
     """A node class representing Product.
@@ -218,6 +250,7 @@ class Product(_Node):
 
     def __init__(self, graph, name=None, summary_cls=AverageSummary):
         super(Product, self).__init__(graph, name)
+        self._id = len(graph.products)
 
         self._summary = None
         self._summary_cls = summary_cls
@@ -252,6 +285,9 @@ class Product(_Node):
             self._summary = self._summary_cls(v)
         else:
             self._summary = self._summary_cls(float(v))
+        if self._graph._finalized:
+            self._graph._summary_vec[self._id] = self._summary.score
+            self._graph._reset_dirty()
 
     def update_summary(self, w):
         """Update summary.
@@ -275,14 +311,19 @@ class Product(_Node):
         """
         old = self.summary.v  # pylint: disable=no-member
 
-        reviewers = self._graph.retrieve_reviewers(self)
-        reviews = [self._graph.retrieve_review(
-            r, self).score for r in reviewers]
-        weights = [w(r.anomalous_score) for r in reviewers]
-        if sum(weights) == 0:
-            self.summary = np.mean(reviews)
+        graph = self._graph
+        if not graph._finalized:
+            graph._finalize()
+        start, end = graph._indptr_p[self._id:self._id + 2]
+        reviews = graph._edge_score_by_p[start:end].astype(np.float64)
+        weights = np.array([
+            w(graph.reviewers[i].anomalous_score)
+            for i in graph._indices_p[start:end]], dtype=np.float64)
+        total = weights.sum()
+        if total == 0:
+            self.summary = reviews.mean()
         else:
-            self.summary = np.average(reviews, weights=weights)
+            self.summary = reviews.dot(weights) / total
         return abs(self.summary.v - old)  # pylint: disable=no-member
 
 
@@ -296,9 +337,15 @@ class BipartiteGraph(object):
         (Default: :class:`ria.credibility.WeightedCredibility`)
       reviewer: Class of reviewers.
       product: Class of products.
+      tol: tolerance of changes to skip updating nodes, default value is 0.
+      dtype: floating point type scores are computed in, default value is
+        numpy.float32. Use numpy.float64 to get the same results as updating
+        each node, e.g. :meth:`Reviewer.update_anomalous_score`.
 
     Attributes:
       alpha: Parameter.
+      tol: Tolerance. See :meth:`update` for details.
+      dtype: Floating point type of score arrays.
       graph: Graph object of networkx.
       reviewers: Collection of reviewers.
       products: Collection of products.
@@ -307,7 +354,8 @@ class BipartiteGraph(object):
 
     def __init__(
             self, summary=AverageSummary, alpha=1,
-            credibility=WeightedCredibility, reviewer=Reviewer, product=Product):
+            credibility=WeightedCredibility, reviewer=Reviewer, product=Product,
+            tol=0., dtype=np.float32):
         """Construct bipartite graph.
 
         Args:
@@ -317,11 +365,27 @@ class BipartiteGraph(object):
                         (Default: WeightedCredibility)
           reviewer: Class of reviewers.
           product: Class of products.
+          tol: tolerance of changes to skip updating nodes, default value is 0.
+          dtype: floating point type scores are computed in, default value is
+            numpy.float32.
         """
         self.alpha = alpha
-        self.graph = nx.DiGraph()
+        self.tol = tol
+        self.dtype = np.dtype(dtype)
         self.reviewers = []
         self.products = []
+        self._inv_n_reviewers = None
+
+        # Edge list the CSR arrays are built from.
+        # Review objects aren't kept but created from scores and dates when
+        # they are retrieved; dates are stored only if they are given.
+        self._src = array("i")
+        self._dst = array("i")
+        self._scores = array("d")
+        self._dates = {}
+        self._edge_index = {}
+        self._finalized = False
+        self._nx_graph = None
 
         self._summary_cls = summary
         self._review_cls = summary.review_class()
@@ -334,7 +398,7 @@ class BipartiteGraph(object):
         """Create a new reviewer.
 
         Args:
-          name: name of the new reviewer.
+          name: name of the new reviewer. It can be a string or an integer.
           anomalous: initial anomalous score. (default: None)
 
         Returns:
@@ -342,24 +406,71 @@ class BipartiteGraph(object):
         """
         n = self._reviewer_cls(
             self, name=name, credibility=self.credibility, anomalous=anomalous)
-        self.graph.add_node(n)
         self.reviewers.append(n)
+        self._inv_n_reviewers = 1. / len(self.reviewers)
+        self._finalized = False
+        self._nx_graph = None
         return n
 
+    def new_reviewers_bulk(self, n, anomalous=None):
+        """Create reviewers at once.
+
+        The new reviewers are named their indices in :attr:`reviewers`.
+
+        Args:
+          n: the number of new reviewers.
+          anomalous: initial anomalous score of them. (default: None)
+
+        Returns:
+          A list of the new reviewer instances.
+        """
+        start = len(self.reviewers)
+        cls = self._reviewer_cls
+        append = self.reviewers.append
+        for i in range(start, start + n):
+            append(cls(
+                self, name=i, credibility=self.credibility, anomalous=anomalous))
+        if self.reviewers:
+            self._inv_n_reviewers = 1. / len(self.reviewers)
+        self._finalized = False
+        self._nx_graph = None
+        return self.reviewers[start:]
+
     def new_product(self, name):
         """Create a new product.
 
         Args:
-          name: name of the new product.
+          name: name of the new product. It can be a string or an integer.
 
         Returns:
           A new product instance.
         """
         n = self._product_cls(self, name, summary_cls=self._summary_cls)
-        self.graph.add_node(n)
         self.products.append(n)
+        self._finalized = False
+        self._nx_graph = None
         return n
 
+    def new_products_bulk(self, n):
+        """Create products at once.
+
+        The new products are named their indices in :attr:`products`.
+
+        Args:
+          n: the number of new products.
+
+        Returns:
+          A list of the new product instances.
+        """
+        start = len(self.products)
+        cls = self._product_cls
+        append = self.products.append
+        for i in range(start, start + n):
+            append(cls(self, i, summary_cls=self._summary_cls))
+        self._finalized = False
+        self._nx_graph = None
+        return self.products[start:]
+
     def add_review(self, reviewer, product, review, date=None):
         """Add a new review from a given reviewer to a given product.
 
@@ -375,20 +486,116 @@ class BipartiteGraph(object):
         Raises:
           TypeError: when given reviewer and product aren't instance of
             specified reviewer and product class when this graph is constructed.
+            This check is skipped when Python runs with optimizations.
         """
-        if not isinstance(reviewer, self._reviewer_cls):
-            raise TypeError(
-                "Type of given reviewer isn't acceptable:", reviewer,
-                ", expected:", self._reviewer_cls)
-        elif not isinstance(product, self._product_cls):
-            raise TypeError(
-                "Type of given product isn't acceptable:", product,
-                ", expected:", self._product_cls)
+        if __debug__:
+            if not isinstance(reviewer, self._reviewer_cls):
+                raise TypeError(
+                    "Type of given reviewer isn't acceptable:", reviewer,
+                    ", expected:", self._reviewer_cls)
+            elif not isinstance(product, self._product_cls):
+                raise TypeError(
+                    "Type of given product isn't acceptable:", product,
+                    ", expected:", self._product_cls)
         r = self._review_cls(review, date=date)
-        self.graph.add_edge(reviewer, product, review=r)
+        key = (reviewer._id, product._id)
+        if key in self._edge_index:
+            # Same as networkx, a second review overwrites the first one.
+            i = self._edge_index[key]
+            self._scores[i] = r.score
+        else:
+            i = len(self._scores)
+            self._edge_index[key] = i
+            self._src.append(key[0])
+            self._dst.append(key[1])
+            self._scores.append(r.score)
+        if r.date is None:
+            self._dates.pop(i, None)
+        else:
+            self._dates[i] = r.date
+        self._finalized = False
+        self._nx_graph = None
         return r
 
-    @memoized
+    def _finalize(self):
+        """Build CSR arrays of the bipartite graph from the added reviews.
+
+        This method builds two compressed sparse row representations;
+        one maps each reviewer to the products it reviews and the other one
+        maps each product to the reviewers who review it.
+        Node indices are positions in :attr:`reviewers` and :attr:`products`.
+        It is called lazily when the graph is traversed after being modified.
+        """
+        # These views share memory with the edge buffers, which can't grow
+        # while the views exist; only copies made from them are kept.
+        src = np.frombuffer(self._src, dtype=np.intc)
+        dst = np.frombuffer(self._dst, dtype=np.intc)
+        scores = np.frombuffer(self._scores).astype(self.dtype)
+
+        order_r = np.lexsort((dst, src))
+        self._indptr_r = indptr(src, len(self.reviewers))
+        self._indices_r = dst[order_r]
+        self._edge_score_by_r = scores[order_r]
+        # Edge indices let rows read the scores in float64.
+        self._edges_r = order_r.astype(np.intc)
+
+        order_p = np.lexsort((src, dst))
+        self._indptr_p = indptr(dst, len(self.products))
+        self._indices_p = src[order_p]
+        self._edge_score_by_p = scores[order_p]
+
+        # The CSR arrays are exposed by views; they are read-only so that
+        # nobody modifies the graph through them.
+        for a in (self._indptr_r, self._indices_r, self._edge_score_by_r,
+                  self._edges_r, self._indptr_p, self._indices_p,
+                  self._edge_score_by_p):
+            a.flags.writeable = False
+
+        self._finalized = True
+        # Uniform credibilities let updates skip multiplying credibilities.
+        self._uniform_cred = isinstance(self.credibility, UniformCredibility)
+        self._credibility_vec = self._build_credibility_vec()
+
+        # Current anomalous scores and summaries; products without given
+        # summaries start from averages.
+        self._anomalous_vec = np.array(
+            [r.anomalous_score for r in self.reviewers], dtype=self.dtype)
+        counts = np.maximum(np.diff(self._indptr_p), 1)
+        self._summary_vec = segment_sum(
+            self._edge_score_by_p, self._indptr_p) / counts.astype(self.dtype)
+        for p in self.products:
+            if p._summary is not None:
+                self._summary_vec[p._id] = p._summary.score
+
+        self._reset_dirty()
+
+    def _reset_dirty(self):
+        """Make the next update recompute every node.
+
+        The states of the previous update are used to skip nodes of which
+        inputs haven't changed. They are reset when scores are set outside of
+        :meth:`update`.
+        """
+        # None means every node is updated.
+        self._weight_vec = None
+        self._dirty_r = None
+
+    def _build_credibility_vec(self):
+        """Compute credibilities of all products.
+
+        Credibilities don't change while updating scores, and thus this method
+        is called once when the CSR arrays are built.
+
+        Returns:
+          an array of which i-th element is the credibility of the i-th product.
+        """
+        if self._uniform_cred:
+            return np.ones(len(self.products), dtype=self.dtype)
+        if hasattr(self.credibility, "vector"):
+            return np.asarray(self.credibility.vector(), dtype=self.dtype)
+        return np.array(
+            [self.credibility(p) for p in self.products], dtype=self.dtype)
+
     def retrieve_products(self, reviewer):
         """Retrieve products reviewed by a given reviewer.
 
@@ -400,15 +607,22 @@ class BipartiteGraph(object):
 
         Raises:
           TypeError: when given reviewer isn't instance of specified reviewer
-            class when this graph is constructed.
+            class when this graph is constructed. This check is skipped when
+            Python runs with optimizations.
         """
-        if not isinstance(reviewer, self._reviewer_cls):
-            raise TypeError(
-                "Type of given reviewer isn't acceptable:", reviewer,
-                ", expected:", self._reviewer_cls)
-        return list(self.graph.successors(reviewer))
+        if __debug__:
+            if not isinstance(reviewer, self._reviewer_cls):
+                raise TypeError(
+                    "Type of given reviewer isn't acceptable:", reviewer,
+                    ", expected:", self._reviewer_cls)
+        if not self._finalized:
+            self._finalize()
+        i = reviewer._id
+        return [
+            self.products[j]
+            for j in self._indices_r[self._indptr_r[i]:self._indptr_r[i + 1]]
+        ]
 
-    @memoized
     def retrieve_reviewers(self, product):
         """Retrieve reviewers who reviewed a given product.
 
@@ -420,15 +634,37 @@ class BipartiteGraph(object):
 
         Raises:
           TypeError: when given product isn't instance of specified product
-            class when this graph is constructed.
+            class when this graph is constructed. This check is skipped when
+            Python runs with optimizations.
         """
-        if not isinstance(product, self._product_cls):
-            raise TypeError(
-                "Type of given product isn't acceptable:", product,
-                ", expected:", self._product_cls)
-        return list(self.graph.predecessors(product))
+        if __debug__:
+            if not isinstance(product, self._product_cls):
+                raise TypeError(
+                    "Type of given product isn't acceptable:", product,
+                    ", expected:", self._product_cls)
+        if not self._finalized:
+            self._finalize()
+        i = product._id
+        return [
+            self.reviewers[j]
+            for j in self._indices_p[self._indptr_p[i]:self._indptr_p[i + 1]]
+        ]
+
+    def product_csr(self):
+        """Get the CSR arrays mapping each product to its reviews.
+
+        The i-th product is reviewed by reviewers of which positions in
+        :attr:`reviewers` are `indices[indptr[i]:indptr[i + 1]]` and the
+        scores of those reviews are `scores[indptr[i]:indptr[i + 1]]`.
+        The arrays are read-only and rebuilt when the graph is modified.
+
+        Returns:
+          a tuple of `indptr`, `indices` and `scores` arrays.
+        """
+        if not self._finalized:
+            self._finalize()
+        return self._indptr_p, self._indices_p, self._edge_score_by_p
 
-    @memoized
     def retrieve_review(self, reviewer, product):
         """Retrieve review that the given reviewer put the given product.
 
@@ -437,55 +673,276 @@ class BipartiteGraph(object):
           product: An instance of Product.
 
         Returns:
-          A review object.
+          A review object. It is created from the stored score and date, and
+          thus it equals but isn't identical to the object
+          :meth:`add_review` returned.
 
         Raises:
           TypeError: when given reviewer and product aren't instance of
             specified reviewer and product class when this graph is constructed.
+            This check is skipped when Python runs with optimizations.
           KeyError: When the reviewer does not review the product.
         """
-        if not isinstance(reviewer, self._reviewer_cls):
-            raise TypeError(
-                "Type of given reviewer isn't acceptable:", reviewer,
-                ", expected:", self._reviewer_cls)
-        elif not isinstance(product, self._product_cls):
-            raise TypeError(
-                "Type of given product isn't acceptable:", product,
-                ", expected:", self._product_cls)
+        if __debug__:
+            if not isinstance(reviewer, self._reviewer_cls):
+                raise TypeError(
+                    "Type of given reviewer isn't acceptable:", reviewer,
+                    ", expected:", self._reviewer_cls)
+            elif not isinstance(product, self._product_cls):
+                raise TypeError(
+                    "Type of given product isn't acceptable:", product,
+                    ", expected:", self._product_cls)
 
         try:
-            return self.graph[reviewer][product]["review"]
-        except TypeError:
+            return self._review(self._edge_index[reviewer._id, product._id])
+        except KeyError:
             raise KeyError(
                 "{0} does not review {1}.".format(reviewer, product))
 
+    def _reviewer_row(self, reviewer):
+        """Find products a reviewer reviews and the scores of the reviews.
+
+        Args:
+          reviewer: a reviewer.
+
+        Returns:
+          a tuple of an array of positions in :attr:`products` of the products
+          the reviewer reviews, and a float64 array of the review scores.
+        """
+        if not self._finalized:
+            self._finalize()
+        start, end = self._indptr_r[reviewer._id:reviewer._id + 2]
+        # Fancy indexing copies the scores, and so the view of the edge
+        # buffer doesn't outlive this method.
+        scores = np.frombuffer(self._scores)[self._edges_r[start:end]]
+        return self._indices_r[start:end], scores
+
+    def _review(self, i):
+        """Create the review object of an edge.
+
+        Args:
+          i: index of the edge.
+
+        Returns:
+          a review object having the score and date of the edge.
+        """
+        return self._review_cls(self._scores[i], date=self._dates.get(i))
+
+    def retrieve_score(self, reviewer, product):
+        """Retrieve the score the given reviewer put the given product.
+
+        Args:
+          reviewer: An instance of Reviewer.
+          product: An instance of Product.
+
+        Returns:
+          A float value representing the review score.
+
+        Raises:
+          TypeError: when given reviewer and product aren't instance of
+            specified reviewer and product class when this graph is constructed.
+            This check is skipped when Python runs with optimizations.
+          KeyError: When the reviewer does not review the product.
+        """
+        if __debug__:
+            if not isinstance(reviewer, self._reviewer_cls):
+                raise TypeError(
+                    "Type of given reviewer isn't acceptable:", reviewer,
+                    ", expected:", self._reviewer_cls)
+            elif not isinstance(product, self._product_cls):
+                raise TypeError(
+                    "Type of given product isn't acceptable:", product,
+                    ", expected:", self._product_cls)
+
+        try:
+            return self._scores[self._edge_index[reviewer._id, product._id]]
+        except KeyError:
+            raise KeyError(
+                "{0} does not review {1}.".format(reviewer, product))
+
+    @property
+    def graph(self):
+        """Graph object of networkx representing this bipartite graph.
+
+        The graph object is built on demand and is only for exporting;
+        updating scores doesn't use it.
+        """
+        if self._nx_graph is None:
+            g = nx.DiGraph()
+            g.add_nodes_from(self.reviewers)
+            g.add_nodes_from(self.products)
+            g.add_edges_from(
+                (self.reviewers[i], self.products[j],
+                 {"review": self._review(k)})
+                for k, (i, j) in enumerate(zip(self._src, self._dst)))
+            self._nx_graph = g
+        return self._nx_graph
+
     def update(self):
         """Update reviewers' anomalous scores and products' summaries.
 
+        This method updates only nodes of which inputs have changed since the
+        previous update; a product's summary is updated when a weight of its
+        reviewers has changed more than :attr:`tol`, and a reviewer's anomalous
+        score is updated when a summary of its products has changed more than
+        :attr:`tol`. With the default tolerance 0, the results are as same as
+        updating every node. Setting an anomalous score or a summary outside of
+        this method makes the next update recompute every node.
+
+        Scores are computed in :attr:`dtype`. With the default float32,
+        differences smaller than about 1e-6 are within rounding errors;
+        thresholds to check convergence should be larger than that.
+
         Returns:
           maximum absolute difference between old summary and new one, and
           old anomalous score and new one.
         """
-        w = self._weight_generator(self.reviewers)
-        diff_p = max(p.update_summary(w) for p in self.products)
-        diff_a = max(r.update_anomalous_score() for r in self.reviewers)
+        if not self._finalized:
+            self._finalize()
+        diff_p = self._update_summaries()
+        diff_a = self._update_anomalous_scores()
         return max(diff_p, diff_a)
 
+    def _update_summaries(self):
+        """Update summaries of products.
+
+        This method computes the same summaries as :meth:`Product.update_summary`
+        but handles products at once with the CSR arrays.
+
+        Returns:
+          maximum absolute difference between old summaries and new ones.
+        """
+        weights = self._weights(self._anomalous_vec)
+        if self._weight_vec is None:
+            dirty = np.diff(self._indptr_p) > 0
+        else:
+            changed = np.abs(weights - self._weight_vec) > self.tol
+            dirty = segment_any(changed[self._indices_p], self._indptr_p)
+        self._weight_vec = weights
+
+        rows = np.flatnonzero(dirty)
+        sub_indptr, pos = select_rows(self._indptr_p, rows)
+        new = weighted_mean(
+            sub_indptr, self._indices_p[pos], self._edge_score_by_p[pos],
+            weights)
+
+        # Fancy indexing copies the old summaries, and the copy is reused as
+        # the buffer of their differences from the new ones.
+        diff = self._summary_vec[rows]
+        products = self.products
+        summary_cls = self._summary_cls
+        for i, v in zip(rows.tolist(), new.tolist()):
+            products[i]._summary = summary_cls(v)
+        self._summary_vec[rows] = new
+        diff -= new
+        np.abs(diff, out=diff)
+
+        changed = np.zeros(len(self.products), dtype=bool)
+        changed[rows] = diff > self.tol
+        if self._dirty_r is None:
+            self._dirty_r = np.diff(self._indptr_r) > 0
+        else:
+            self._dirty_r = segment_any(
+                changed[self._indices_r], self._indptr_r)
+
+        return float(diff.max()) if len(rows) else 0.
+
+    def _update_anomalous_scores(self):
+        """Update anomalous scores of reviewers.
+
+        This method computes the same anomalous scores as
+        :meth:`Reviewer.update_anomalous_score` but handles reviewers at
+        once with the CSR arrays and the summaries computed by
+        :meth:`_update_summaries`.
+
+        Returns:
+          maximum absolute difference between old anomalous scores and
+          new ones.
+        """
+        rows = np.flatnonzero(self._dirty_r)
+        sub_indptr, pos = select_rows(self._indptr_r, rows)
+        if self._uniform_cred:
+            new = mean_deviation(
+                sub_indptr, self._indices_r[pos], self._edge_score_by_r[pos],
+                self._summary_vec)
+        else:
+            new = weighted_deviation(
+                sub_indptr, self._indices_r[pos], self._edge_score_by_r[pos],
+                self._summary_vec, self._credibility_vec)
+
+        # Differences are computed from the stored scores, which replace 0
+        # with the default score as Reviewer.update_anomalous_score does.
+        diff = self._anomalous_vec[rows]
+        diff -= self._store_anomalous_scores(rows, new)
+        np.abs(diff, out=diff)
+        return float(diff.max()) if len(rows) else 0.
+
+    def _store_anomalous_scores(self, rows, scores):
+        """Store updated anomalous scores to reviewers.
+
+        Args:
+          rows: indices of the reviewers to be updated.
+          scores: an array of new anomalous scores of those reviewers.
+
+        Returns:
+          an array of the stored scores, which are the anomalous scores the
+          reviewers read.
+        """
+        reviewers = self.reviewers
+        for i, v in zip(rows.tolist(), scores.tolist()):
+            reviewers[i]._anomalous = v
+        # Same as Reviewer.anomalous_score, a score 0 reads as the default.
+        stored = np.where(
+            scores != 0, scores, self.dtype.type(self._inv_n_reviewers))
+        self._anomalous_vec[rows] = stored
+        return stored
+
+    def _weights(self, scores):
+        """Compute weights of reviewers.
+
+        This method computes the same weights as :meth:`_weight_generator`
+        in the floating point type of the given scores, without creating
+        the weight function.
+
+        Args:
+          scores: an array of anomalous scores of reviewers.
+
+        Returns:
+          an array of weights of the given anomalous scores.
+        """
+        sigma = scores.std() if len(scores) else 0
+        if not sigma:
+            # Sigma = 0 means all reviews have same anomalous scores.
+            return np.ones_like(scores)
+        dtype = scores.dtype.type
+        return sigmoid_weights(
+            scores, dtype(scores.mean()), dtype(sigma), dtype(self.alpha))
+
     def _weight_generator(self, reviewers):
-        """Compute a weight function for the given reviewers.
+        """Compute weights and a weight function for the given reviewers.
+
+        The mean and standard deviation of the anomalous scores are computed
+        once, and both of the weights and the function use them.
 
         Args:
           reviewers: a set of reviewers to compute weight function.
 
         Returns:
-          a function computing a weight for a reviewer.
+          a tuple of a float64 array of which i-th element is the weight of
+          the i-th given reviewer, and a function computing a weight for an
+          anomalous score.
         """
         scores = [r.anomalous_score for r in reviewers]
-        mu = np.average(scores)
-        sigma = np.std(scores)
+        mu, sigma = mean_std(scores)
 
         if sigma:
-            def w(v):
+            weights = sigmoid_weights(
+                np.array(scores, dtype=np.float64), mu, sigma,
+                float(self.alpha))
+
+            # Constants are bound to default arguments so that they are
+            # loaded as local variables in each call.
+            def w(v, _exp=math.exp, _mu=mu, _coef=self.alpha / sigma):
                 """Compute a weight for the given reviewer.
 
                 Args:
@@ -494,17 +951,16 @@ class BipartiteGraph(object):
                   weight of the given anomalous score.
                 """
                 try:
-                    exp = math.exp(self.alpha * (v - mu) / sigma)
-                    return 1. / (1. + exp)
+                    return 1. / (1. + _exp(_coef * (v - _mu)))
                 except OverflowError:
                     return 0.
 
-            return w
+            return weights, w
 
         else:
             # Sigma = 0 means all reviews have same anomalous scores.
             # In this case, all reviews should be treated as same.
-            return lambda v: 1.
+            return np.ones(len(scores)), lambda v: 1.
 
     def dump_credibilities(self, output):
         """Dump credibilities of all products.
@@ -526,3 +982,22 @@ class BipartiteGraph(object):
           PyDot object representing this graph.
         """
         return nx.nx_pydot.to_pydot(self.graph)
+
+    def biadjacency_matrix(self):
+        """Biadjacency matrix of this graph.
+
+        Rows and columns of the matrix correspond to reviewers and products,
+        respectively, and the (i, j) element is the score the i-th reviewer
+        gave to the j-th product. The matrix is built from copies of the CSR
+        arrays of this graph so that modifying it doesn't affect the graph.
+        This method requires SciPy.
+
+        Returns:
+          an instance of scipy.sparse.csr_matrix.
+        """
+        from scipy import sparse
+        if not self._finalized:
+            self._finalize()
+        return sparse.csr_matrix(
+            (self._edge_score_by_r, self._indices_r, self._indptr_r),
+            shape=(len(self.reviewers), len(self.products)), copy=True)
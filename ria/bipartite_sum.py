@@ -24,7 +24,9 @@ The bipartite graph implemented in this module uses normalized summations for
 updated anomalous scores.
 """
 from __future__ import absolute_import
+import numpy as np
 from ria import bipartite
+from ria._kernels import segment_sum
 
 
 class Reviewer(bipartite.Reviewer):
@@ -57,12 +59,8 @@ class Reviewer(bipartite.Reviewer):
         """
         old = self.anomalous_score
 
-        products = self._graph.retrieve_products(self)
-        self.anomalous_score = sum(
-            p.summary.difference(
-                self._graph.retrieve_review(self, p)) * self._credibility(p) - 0.5
-            for p in products
-        )
+        diffs, weights = self._deviations()
+        self.anomalous_score = diffs.dot(weights) - 0.5 * len(diffs)
 
         return abs(self.anomalous_score - old)
 
@@ -73,6 +71,14 @@ class BipartiteGraph(bipartite.BipartiteGraph):
     This graph employs a normalized summation of deviation times credibility
     as the undated anomalous scores for each reviewer.
 
+    :meth:`update` updates summaries of products in the manner of
+    :class:`ria.bipartite.BipartiteGraph`, and then updates anomalous scores
+    of reviewers by computing the summation of deviation times credibility.
+    See :meth:`Reviewer.update_anomalous_score` for more details.
+    After that those updated anomalous scores are normalized so that every
+    value is in :math:`[0, 1]`. The difference :meth:`update` returns isn't
+    normalized and thus it may be greater than actual normalized difference.
+
     Constructor receives as same arguments as
     :class:`ria.bipartite.BipartiteGraph` but `reviewer` argument is ignored
     since this graph uses :class:`ria.bipartite_sum.Reviewer` instead.
@@ -82,39 +88,38 @@ class BipartiteGraph(bipartite.BipartiteGraph):
         kwargs["reviewer"] = Reviewer
         super(BipartiteGraph, self).__init__(**kwargs)
 
-    def update(self):
-        """ Update reviewers' anomalous scores and products' summaries.
-
-        The update consists of 2 steps;
-
-        Step1 (updating summaries):
-            Update summaries of products with anomalous scores of reviewers
-            and weight function. The weight is calculated by the manner in
-            :class:`ria.bipartite.BipartiteGraph`.
+    def _update_anomalous_scores(self):
+        """Update anomalous scores of all reviewers.
 
-        Step2 (updating anomalous scores):
-            Update its anomalous score of each reviewer by computing the summation
-            of deviation times credibility.
-            See :meth:`Reviewer.update_anomalous_score` for more details.
-            After that those updated anomalous scores are normalized so that
-            every value is in :math:`[0, 1]`.
+        This method computes the same anomalous scores as
+        :meth:`Reviewer.update_anomalous_score` for every reviewer at once
+        with the CSR arrays, and then normalizes them so that every value is in
+        :math:`[0, 1]`.
 
         Returns:
-          maximum absolute difference between old summary and new one, and
-            old anomalous score and new one. This value is not normalized and
-            thus it may be grater than actual normalized difference.
+          maximum absolute difference between old anomalous scores and
+          new ones before normalized.
         """
-        res = super(BipartiteGraph, self).update()
-
-        max_v = None
-        min_v = float("inf")
-        for r in self.reviewers:
-            max_v = max(max_v, r.anomalous_score)
-            min_v = min(min_v, r.anomalous_score)
-
-        width = max_v - min_v
+        if not self.reviewers:
+            return 0.
+
+        indices = self._indices_r
+        # Partial scores are computed in place of the gathered summaries.
+        partial = self._summary_vec[indices]
+        partial -= self._edge_score_by_r
+        np.abs(partial, out=partial)
+        if not self._uniform_cred:
+            partial *= self._credibility_vec[indices]
+        partial -= self.dtype.type(0.5)
+        scores = segment_sum(partial, self._indptr_r)
+
+        delta = scores - self._anomalous_vec
+        diff = float(np.abs(delta, out=delta).max())
+
+        min_v = scores.min()
+        width = scores.max() - min_v
         if width:
-            for r in self.reviewers:
-                r.anomalous_score = (r.anomalous_score - min_v) / width
+            scores = (scores - min_v) / width
+        self._store_anomalous_scores(np.arange(len(scores)), scores)
 
-        return res
+        return diff
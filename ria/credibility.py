@@ -25,7 +25,7 @@ This method receives only one argument, an instance of
 :class:`ria.bipartite.Product`, and return a value of credibility.
 
 This module has a helper base class :class:`GraphBasedCredibility`
-which provides two helper functions traversing a bipartite graph.
+which provides helper functions traversing a bipartite graph.
 
 The credibilities defined in this module are;
 
@@ -35,7 +35,7 @@ The credibilities defined in this module are;
 """
 from __future__ import absolute_import
 import numpy as np
-from common import memoized
+from ria._kernels import segment_sum
 
 
 class UniformCredibility(object):
@@ -74,8 +74,8 @@ class GraphBasedCredibility(object):
     Args:
       g: A bipartite graph instance.
 
-    This class provides two helper methods; :meth:`reviewers` and
-    :meth:`review_score`.
+    This class provides helper methods; :meth:`reviewers`,
+    :meth:`reviewer_indices`, and :meth:`review_score`.
     """
     __slots__ = ("_g")
 
@@ -106,6 +106,24 @@ class GraphBasedCredibility(object):
         """
         return self._g.retrieve_reviewers(product)
 
+    def reviewer_indices(self, product):
+        """Find indices of reviewers who have reviewed a given product.
+
+        The returned array is a read-only view of the CSR arrays of the graph,
+        which are rebuilt only when reviews are added, and thus no copies are
+        made.
+
+        Args:
+          product: An instance of :class:`ria.bipartite.Product`.
+
+        Returns:
+          An int32 array of positions in the graph's reviewers of the reviewers
+          who have reviewed the product.
+        """
+        indptr, indices, _ = self._g.product_csr()
+        i = product._id
+        return indices[indptr[i]:indptr[i + 1]]
+
     def review_score(self, reviewer, product):
         """Find a review score from a given reviewer to a product.
 
@@ -114,9 +132,9 @@ class GraphBasedCredibility(object):
           product: Product i.e. an instance of :class:`ria.bipartite.Product`.
 
         Returns:
-          A review object representing the review from the reviewer to the product.
+          A float value representing the review from the reviewer to the product.
         """
-        return self._g.retrieve_review(reviewer, product).score
+        return self._g.retrieve_score(reviewer, product)
 
 
 class WeightedCredibility(GraphBasedCredibility):
@@ -148,7 +166,13 @@ class WeightedCredibility(GraphBasedCredibility):
     where :math:`{\\rm review}(r, p)` is a review from reviewer *r* to
     product *p*.
     """
-    @memoized
+    __slots__ = ("_vec", "_indptr")
+
+    def __init__(self, g):
+        super(WeightedCredibility, self).__init__(g)
+        self._vec = None
+        self._indptr = None
+
     def __call__(self, product):
         """ Compute credibility of a given product.
 
@@ -158,14 +182,34 @@ class WeightedCredibility(GraphBasedCredibility):
         Returns:
           The credibility of the product. It is >= 0.5.
         """
-        reviewers = self.reviewers(product)
-        Nq = len(reviewers)
+        return float(self.vector()[product._id])
 
-        if Nq == 1:
-            return 0.5
+    def vector(self):
+        """Compute credibilities of all products.
 
-        else:
+        Credibilities depend only on review scores, and thus they are computed
+        once from the CSR arrays of the graph and cached until the graph is
+        modified.
+
+        Returns:
+          a float64 array of which i-th element is the credibility of the i-th
+          product in the graph.
+        """
+        indptr, _, scores = self._g.product_csr()
+        if self._indptr is indptr:
+            return self._vec
+
+        # A float64 copy of the scores, which is overwritten by deviations.
+        dev = scores.astype(np.float64)
+        counts = np.diff(indptr)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = segment_sum(dev, indptr) / counts
             # Computing the unbiased variance of scores.
-            var = np.var([self.review_score(r, product)
-                          for r in reviewers], ddof=1)
-            return np.log(Nq) / (var + 1)
+            dev -= np.repeat(means, counts)
+            np.square(dev, out=dev)
+            var = segment_sum(dev, indptr) / (counts - 1)
+            cred = np.where(counts == 1, 0.5, np.log(counts) / (var + 1))
+
+        self._vec = cred
+        self._indptr = indptr
+        return self._vec
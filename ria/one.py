@@ -33,12 +33,30 @@ class BipartiteGraph(bipartite.BipartiteGraph):
 
     Attributes:
       updated: Whether :meth:`update` has been called. If True, that method does
-        nothing.
+        nothing. Setting False allows the graph to be updated once again.
     """
 
     def __init__(self, **kwargs):
         super(BipartiteGraph, self).__init__(**kwargs)
-        self.updated = False
+        self._updated = False
+
+    @property
+    def updated(self):
+        """Whether :meth:`update` has been called.
+        """
+        return self._updated
+
+    @updated.setter
+    def updated(self, v):
+        """Set whether :meth:`update` has been called.
+
+        Args:
+          v: the new flag.
+        """
+        self._updated = bool(v)
+        if not self._updated:
+            # Remove the no-op set by update so that it works again.
+            self.__dict__.pop("update", None)
 
     def update(self):
         """Update reviewers' anomalous scores and products' summaries.
@@ -52,4 +70,15 @@ class BipartiteGraph(bipartite.BipartiteGraph):
 
         res = super(BipartiteGraph, self).update()
         self.updated = True
+        # Following calls go to the no-op directly instead of this method.
+        self.update = _noop_update
         return res
+
+
+def _noop_update():
+    """Do nothing since the graph has been updated.
+
+    Returns:
+      0 which means nothing has been changed.
+    """
+    return 0
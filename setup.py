@@ -21,8 +21,13 @@
 # pylint: skip-file
 """Package information of repeated improvement analysis algorithm.
 """
+import sys
 from os import path
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
 
 
 def read(fname):
@@ -44,6 +49,25 @@ def load_requires_from_file(filepath):
         return [pkg_name.strip() for pkg_name in fp.readlines()]
 
 
+def ext_modules():
+    """Return extension modules to be built.
+
+    The Cython kernels are built only if Cython is available. They are
+    optional; if the build fails, the package falls back to Numba or NumPy.
+
+    Returns:
+      a list of extension modules.
+    """
+    if cythonize is None:
+        return []
+    args = ["-fopenmp"] if sys.platform.startswith("linux") else []
+    return cythonize([
+        Extension(
+            "ria._ckernels", ["ria/_ckernels.pyx"], optional=True,
+            extra_compile_args=args, extra_link_args=args)
+    ])
+
+
 setup(
     name='rgmining-ria',
     use_scm_version=True,
@@ -53,10 +77,15 @@ setup(
     long_description=read("README.rst"),
     url="https://github.com/rgmining/ria",
     packages=find_packages(exclude=["tests"]),
+    ext_modules=ext_modules(),
     setup_requires=[
         "setuptools_scm"
     ],
     install_requires=load_requires_from_file("requirements.txt"),
+    extras_require={
+        "numba": ["numba"],
+        "scipy": ["scipy"],
+    },
     test_suite='tests.suite',
     license="GPLv3",
     classifiers=[
@@ -0,0 +1,108 @@
+#
+# _graph_fixtures.py
+#
+# Copyright (c) 2016-2017 Junpei Kawamoto
+#
+# This file is part of rgmining-ria.
+#
+# rgmining-ria is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-ria is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with rgmining-ria. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Provide a sample graph shared by unit tests.
+
+The sample graph is the following.
+
+.. graphviz::
+
+   digraph bipartite {
+      graph [rankdir = LR];
+      "reviewer-0";
+      "reviewer-1";
+      "product-0";
+      "product-1";
+      "product-2";
+      "reviewer-0" -> "product-0";
+      "reviewer-0" -> "product-1";
+      "reviewer-0" -> "product-2";
+      "reviewer-1" -> "product-1";
+      "reviewer-1" -> "product-2";
+   }
+
+"""
+import copy
+import random
+import unittest
+
+N_REVIEWERS = 2
+"""The number of reviewers in the sample graph."""
+
+N_PRODUCTS = 3
+"""The number of products in the sample graph."""
+
+EDGES = tuple(
+    (i, j) for i in range(N_REVIEWERS) for j in range(i, N_PRODUCTS))
+"""Pairs of reviewer and product indices of the reviews in the sample graph."""
+
+
+def make_sample_graph(graph_cls, ratings=(0.1, 0.8)):
+    """Create the sample graph.
+
+    Args:
+      graph_cls: a bipartite graph class to be instantiated without arguments.
+      ratings: ratings the reviewers post, i.e. reviewer-i posts ratings[i]
+        to every product it reviews. (default: (0.1, 0.8))
+
+    Returns:
+      a tuple of the graph, a list of reviewers, a list of products, and
+      a dictionary mapping a pair of reviewer and product indices to the review.
+    """
+    graph = graph_cls()
+    reviewers = [
+        graph.new_reviewer("reviewer-{0}".format(i))
+        for i in range(N_REVIEWERS)]
+    products = [
+        graph.new_product("product-{0}".format(j)) for j in range(N_PRODUCTS)]
+    reviews = {
+        (i, j): graph.add_review(reviewers[i], products[j], ratings[i])
+        for i, j in EDGES}
+    return graph, reviewers, products, reviews
+
+
+class SampleGraphTestCase(unittest.TestCase):
+    """Base test case sharing one sample graph among its tests.
+
+    The sample graph is built once per test case class in :meth:`setUpClass`,
+    and each test receives a deep copy of it so that tests modifying the graph
+    don't affect other tests.
+
+    Attributes:
+      graph_cls: the bipartite graph class of the sample graph.
+      ratings: ratings the reviewers post. See :func:`make_sample_graph`.
+    """
+    graph_cls = None
+    ratings = (0.1, 0.8)
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the sample graph shared by tests.
+        """
+        random.seed(0)
+        cls.graph, cls.reviewers, cls.products, cls.reviews = \
+            make_sample_graph(cls.graph_cls, cls.ratings)
+
+    def setUp(self):
+        """Copy the sample graph for the test.
+        """
+        self.graph, self.reviewers, self.products, self.reviews = \
+            copy.deepcopy(
+                (self.graph, self.reviewers, self.products, self.reviews))
@@ -21,12 +21,12 @@
 """Unit test for ria.bipartite_sum module.
 """
 # pylint: disable=protected-access
-from collections import defaultdict
 import unittest
 from ria import bipartite_sum
+from tests._graph_fixtures import SampleGraphTestCase
 
 
-class TestReviewer(unittest.TestCase):
+class TestReviewer(SampleGraphTestCase):
     """Test case for reviewer class in bipartite_sum module.
 
     This test case uses the following sample graph.
@@ -49,19 +49,7 @@ class TestReviewer(unittest.TestCase):
 
     """
 
-    def setUp(self):
-        """Set up for tests.
-        """
-        self.graph = bipartite_sum.BipartiteGraph()
-        self.reviewers = [
-            self.graph.new_reviewer("reviewer-{0}".format(i)) for i in range(2)]
-        self.products = [
-            self.graph.new_product("product-{0}".format(i)) for i in range(3)]
-        self.reviews = defaultdict(dict)
-        for i, r in enumerate(self.reviewers):
-            for j in range(i, len(self.products)):
-                self.reviews[i][j] = self.graph.add_review(
-                    r, self.products[j], 0.1 if i == 0 else 0.8)
+    graph_cls = bipartite_sum.BipartiteGraph
 
     def test_update_anomalous_score(self):
         """Test updating anomalous scores.
@@ -82,8 +70,8 @@ class TestReviewer(unittest.TestCase):
         review and credibility of product :math:`p`, respectively.
         """
         res = 0
-        for i, r in enumerate(self.reviews[0].values()):
-            p = self.products[i]
+        for i, p in enumerate(self.products):
+            r = self.reviews[0, i]
             c = self.reviewers[0]._credibility(p)
             res += p.summary.difference(r) * c - 0.5
 
@@ -93,5 +81,22 @@ class TestReviewer(unittest.TestCase):
         self.assertAlmostEqual(self.reviewers[0].anomalous_score, res)
 
 
+class TestBipartiteGraph(SampleGraphTestCase):
+    """Test case for BipartiteGraph class in bipartite_sum module.
+
+    This test case uses the same sample graph as :class:`TestReviewer`.
+    """
+
+    graph_cls = bipartite_sum.BipartiteGraph
+
+    def test_update(self):
+        """Test updated anomalous scores are normalized into [0, 1].
+        """
+        self.graph.update()
+        scores = [r._anomalous for r in self.reviewers]
+        self.assertAlmostEqual(min(scores), 0)
+        self.assertAlmostEqual(max(scores), 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -22,15 +22,19 @@
 """
 # pylint: disable=protected-access
 from __future__ import division
-from collections import defaultdict
 import numpy as np
 import random
 import unittest
 from ria import bipartite
 from review import AverageReview, AverageSummary
+from tests._graph_fixtures import SampleGraphTestCase
+try:
+    from scipy import sparse
+except ImportError:  # pragma: no cover
+    sparse = None
 
 
-class TestReviewer(unittest.TestCase):
+class TestReviewer(SampleGraphTestCase):
     """Test case for Reviewer class.
 
 
@@ -54,19 +58,7 @@ class TestReviewer(unittest.TestCase):
 
     """
 
-    def setUp(self):
-        """Set up for tests.
-        """
-        self.graph = bipartite.BipartiteGraph()
-        self.reviewers = [
-            self.graph.new_reviewer("reviewer-{0}".format(i)) for i in range(2)]
-        self.products = [
-            self.graph.new_product("product-{0}".format(i)) for i in range(3)]
-        self.reviews = defaultdict(dict)
-        for i, r in enumerate(self.reviewers):
-            for j in range(i, len(self.products)):
-                self.reviews[i][j] = self.graph.add_review(
-                    r, self.products[j], 0.1 if i == 0 else 0.8)
+    graph_cls = bipartite.BipartiteGraph
 
     def test_anomalous_score(self):
         """Test anomalous_score property.
@@ -105,8 +97,8 @@ class TestReviewer(unittest.TestCase):
         """
         res = 0
         weight = 0
-        for i, r in enumerate(self.reviews[0].values()):
-            p = self.products[i]
+        for i, p in enumerate(self.products):
+            r = self.reviews[0, i]
             c = self.reviewers[0]._credibility(p)
             res += p.summary.difference(r) * c
             weight += c
@@ -117,8 +109,22 @@ class TestReviewer(unittest.TestCase):
                                abs(old - expected))
         self.assertAlmostEqual(self.reviewers[0].anomalous_score, expected)
 
+    def test_update_anomalous_score_in_float64(self):
+        """Test anomalous scores use the reviewer's credibility in float64.
+        """
+        reviewer = self.reviewers[0]
+        reviewer._credibility = lambda p: p._id + 1.
+        for p in self.products:
+            p.summary = (p._id + 1) / 3
+
+        res = sum(
+            abs(0.1 - (j + 1) / 3) * (j + 1) for j in range(len(self.products)))
+        expected = res / sum(j + 1 for j in range(len(self.products)))
+        reviewer.update_anomalous_score()
+        self.assertAlmostEqual(reviewer.anomalous_score, expected, places=12)
+
 
-class TestProduct(unittest.TestCase):
+class TestProduct(SampleGraphTestCase):
     """Test case for Product class.
 
 
@@ -142,19 +148,7 @@ class TestProduct(unittest.TestCase):
 
     """
 
-    def setUp(self):
-        """Set up for tests.
-        """
-        self.graph = bipartite.BipartiteGraph()
-        self.reviewers = [
-            self.graph.new_reviewer("reviewer-{0}".format(i)) for i in range(2)]
-        self.products = [
-            self.graph.new_product("product-{0}".format(i)) for i in range(3)]
-        self.reviews = defaultdict(dict)
-        for i, r in enumerate(self.reviewers):
-            for j in range(i, len(self.products)):
-                self.reviews[i][j] = self.graph.add_review(
-                    r, self.products[j], 0.1 if i == 0 else 0.8)
+    graph_cls = bipartite.BipartiteGraph
 
     def test_summary(self):
         """Test summary property.
@@ -190,11 +184,11 @@ class TestProduct(unittest.TestCase):
         review(:math:`r, p`) and weight(:math:`r`) are
         the review and weight of the reviewer :math:`r`, respectively.
         """
-        w = self.graph._weight_generator(self.reviewers)
+        _, w = self.graph._weight_generator(self.reviewers)
         res = 0
         weights = 0
         for i, r in enumerate(self.reviewers):
-            res += self.reviews[i][2].score * w(r.anomalous_score)
+            res += self.reviews[i, 2].score * w(r.anomalous_score)
             weights += w(r.anomalous_score)
         old = self.products[2].summary.score
         expected = res / weights
@@ -239,6 +233,39 @@ class TestBipartiteGraphConstruction(unittest.TestCase):
         self.assertIn(r1, self.graph.reviewers)
         self.assertIn(r2, self.graph.reviewers)
 
+    def test_new_reviewers_bulk(self):
+        """Test for creating reviewers at once.
+        """
+        r0 = self.graph.new_reviewer("test-reviewer")
+        reviewers = self.graph.new_reviewers_bulk(3, 0.2)
+        self.assertEqual([r.name for r in reviewers], [1, 2, 3])
+        self.assertEqual(self.graph.reviewers, [r0] + reviewers)
+        for r in reviewers:
+            self.assertIsInstance(r, self.graph._reviewer_cls)
+            self.assertEqual(str(r), str(r.name))
+            self.assertAlmostEqual(r.anomalous_score, 0.2)
+        self.assertAlmostEqual(r0.anomalous_score, 0.25)
+
+    def test_integer_names(self):
+        """Test for creating nodes named integers.
+
+        Name 0 must be kept instead of being replaced with the default name.
+        """
+        r = self.graph.new_reviewer(0)
+        p = self.graph.new_product(0)
+        for n in (r, p):
+            self.assertEqual(n.name, 0)
+            self.assertEqual(str(n), "0")
+
+    def test_new_products_bulk(self):
+        """Test for creating products at once.
+        """
+        products = self.graph.new_products_bulk(2)
+        self.assertEqual([p.name for p in products], [0, 1])
+        self.assertEqual(self.graph.products, products)
+        for p in products:
+            self.assertIsInstance(p, self.graph._product_cls)
+
     def test_new_product(self):
         """Test for creating products.
         """
@@ -287,7 +314,7 @@ class TestBipartiteGraphConstruction(unittest.TestCase):
             self.graph.add_review(products[0], products[0], 0.1)
 
 
-class TestRetrievNodes(unittest.TestCase):
+class TestRetrievNodes(SampleGraphTestCase):
     """Test case for retrieving nodes.
 
     This test case uses the following sample graph.
@@ -310,19 +337,7 @@ class TestRetrievNodes(unittest.TestCase):
 
     """
 
-    def setUp(self):
-        """Set up for tests.
-        """
-        self.graph = bipartite.BipartiteGraph()
-        self.reviewers = [
-            self.graph.new_reviewer("reviewer-{0}".format(i)) for i in range(2)]
-        self.products = [
-            self.graph.new_product("product-{0}".format(i)) for i in range(3)]
-        self.reviews = defaultdict(dict)
-        for i, r in enumerate(self.reviewers):
-            for j in range(i, len(self.products)):
-                self.reviews[i][j] = self.graph.add_review(
-                    r, self.products[j], 0.1 if i == 0 else 0.8)
+    graph_cls = bipartite.BipartiteGraph
 
     def test_retrieve_reviewers(self):
         """Test retriving reviewers from a product.
@@ -354,6 +369,19 @@ class TestRetrievNodes(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.graph.retrieve_products(self.products[0])
 
+    def test_retrieve_after_adding_reviews(self):
+        """Test retrieved nodes reflect reviews added after retrieving.
+        """
+        self.graph.retrieve_products(self.reviewers[1])
+        self.graph.retrieve_reviewers(self.products[0])
+        self.graph.add_review(self.reviewers[1], self.products[0], 0.5)
+        self.assertEqual(
+            set(self.graph.retrieve_products(self.reviewers[1])),
+            set(self.products))
+        self.assertEqual(
+            set(self.graph.retrieve_reviewers(self.products[0])),
+            set(self.reviewers))
+
     def test_retrieve_review(self):
         """Test retriving reviews from a reviewer and a product.
 
@@ -362,14 +390,259 @@ class TestRetrievNodes(unittest.TestCase):
         """
         for i, r in enumerate(self.reviewers):
             for j, p in enumerate(self.products):
-                if j in self.reviews[i]:
+                if (i, j) in self.reviews:
                     self.assertEqual(
-                        self.graph.retrieve_review(r, p), self.reviews[i][j])
+                        self.graph.retrieve_review(r, p), self.reviews[i, j])
         with self.assertRaises(TypeError):
             self.graph.retrieve_review(self.reviewers[0], self.reviewers[1])
         with self.assertRaises(TypeError):
             self.graph.retrieve_review(self.products[0], self.products[1])
 
+    def test_retrieve_review_with_date(self):
+        """Test retrieved reviews have dates given when they are added.
+        """
+        self.graph.add_review(self.reviewers[1], self.products[0], 0.5, 10)
+        review = self.graph.retrieve_review(self.reviewers[1], self.products[0])
+        self.assertEqual(review.score, 0.5)
+        self.assertEqual(review.date, 10)
+
+        self.graph.add_review(self.reviewers[1], self.products[0], 0.6)
+        review = self.graph.retrieve_review(self.reviewers[1], self.products[0])
+        self.assertEqual(review.score, 0.6)
+        self.assertIsNone(review.date)
+        self.assertIsNone(
+            self.graph.retrieve_review(self.reviewers[0], self.products[0]).date)
+
+    def test_retrieve_score(self):
+        """Test retriving review scores from a reviewer and a product.
+
+        Sample graph used in this test is as same as
+        :meth:`test_retrieve_reviewers`.
+        """
+        for i, r in enumerate(self.reviewers):
+            for j, p in enumerate(self.products):
+                if (i, j) in self.reviews:
+                    self.assertEqual(
+                        self.graph.retrieve_score(r, p),
+                        self.reviews[i, j].score)
+        with self.assertRaises(KeyError):
+            self.graph.retrieve_score(self.reviewers[1], self.products[0])
+        with self.assertRaises(TypeError):
+            self.graph.retrieve_score(self.reviewers[0], self.reviewers[1])
+
+    def test_product_csr(self):
+        """Test the CSR arrays mapping each product to its reviews.
+        """
+        indptr, indices, scores = self.graph.product_csr()
+        self.assertEqual(list(indptr), [0, 1, 3, 5])
+        for j in range(len(self.products)):
+            self.assertEqual(
+                sorted(indices[indptr[j]:indptr[j + 1]]),
+                sorted(i for i, k in self.reviews if k == j))
+            for i, s in zip(
+                    indices[indptr[j]:indptr[j + 1]],
+                    scores[indptr[j]:indptr[j + 1]]):
+                self.assertAlmostEqual(s, self.reviews[i, j].score, places=6)
+        for a in (indptr, indices, scores):
+            with self.assertRaises(ValueError):
+                a[0] = 0
+
+    @unittest.skipIf(sparse is None, "SciPy is not installed")
+    def test_biadjacency_matrix(self):
+        """Test the biadjacency matrix.
+
+        Sample graph used in this test is as same as
+        :meth:`test_retrieve_reviewers`.
+        """
+        m = self.graph.biadjacency_matrix()
+        self.assertIsInstance(m, sparse.csr_matrix)
+        self.assertEqual(m.shape, (2, 3))
+        for i in range(len(self.reviewers)):
+            for j in range(len(self.products)):
+                if (i, j) in self.reviews:
+                    self.assertAlmostEqual(
+                        m[i, j], self.reviews[i, j].score, places=6)
+                else:
+                    self.assertEqual(m[i, j], 0)
+
+    @unittest.skipIf(sparse is None, "SciPy is not installed")
+    def test_modify_biadjacency_matrix(self):
+        """Modifying the biadjacency matrix doesn't affect the graph.
+        """
+        m = self.graph.biadjacency_matrix()
+        m.data[:] = 0
+        m.eliminate_zeros()
+        self.assertEqual(m.nnz, 0)
+        for (i, j), review in self.reviews.items():
+            self.assertEqual(
+                self.graph.retrieve_review(
+                    self.reviewers[i], self.products[j]).score,
+                review.score)
+        self.assertEqual(self.graph.biadjacency_matrix().nnz, len(self.reviews))
+
+
+class TestUpdate(unittest.TestCase):
+    """Test case for updating scores of a bipartite graph.
+
+    This test case uses the following sample graph.
+
+    .. graphviz::
+
+       digraph bipartite {
+          graph [rankdir = LR];
+          "reviewer-0";
+          "reviewer-1";
+          "reviewer-2";
+          "product-0";
+          "product-1";
+          "reviewer-0" -> "product-0" [label="0.1"];
+          "reviewer-1" -> "product-0" [label="0.9"];
+          "reviewer-1" -> "product-1" [label="0.9"];
+          "reviewer-2" -> "product-1" [label="0.2"];
+       }
+
+    """
+
+    def make_graph(self, tol, dtype=np.float32):
+        """Create the sample graph.
+
+        Args:
+          tol: tolerance of the graph.
+          dtype: floating point type of the graph.
+
+        Returns:
+          a tuple of the graph, reviewers, and products.
+        """
+        graph = bipartite.BipartiteGraph(tol=tol, dtype=dtype)
+        reviewers = [
+            graph.new_reviewer("reviewer-{0}".format(i)) for i in range(3)]
+        products = [
+            graph.new_product("product-{0}".format(i)) for i in range(2)]
+        graph.add_review(reviewers[0], products[0], 0.1)
+        graph.add_review(reviewers[1], products[0], 0.9)
+        graph.add_review(reviewers[1], products[1], 0.9)
+        graph.add_review(reviewers[2], products[1], 0.2)
+        return graph, reviewers, products
+
+    def update_each_node(self, graph, reviewers, products):
+        """Update the given graph by updating each node.
+
+        Args:
+          graph: the graph to be updated.
+          reviewers: reviewers in the graph.
+          products: products in the graph.
+        """
+        _, w = graph._weight_generator(reviewers)
+        for p in products:
+            p.update_summary(w)
+        for r in reviewers:
+            r.update_anomalous_score()
+
+    def assert_same_scores(self, nodes, expected, places):
+        """Assert two graphs have same anomalous scores and summaries.
+
+        Args:
+          nodes: a tuple of reviewers and products of a graph.
+          expected: a tuple of reviewers and products of the expected graph.
+          places: decimal places scores are compared in.
+        """
+        for r, e in zip(nodes[0], expected[0]):
+            self.assertAlmostEqual(
+                r.anomalous_score, e.anomalous_score, places=places)
+        for p, e in zip(nodes[1], expected[1]):
+            self.assertAlmostEqual(
+                p.summary.score, e.summary.score, places=places)
+
+    def check_update(self, dtype, places):
+        """Check updated scores are as same as updating each node.
+
+        Args:
+          dtype: floating point type of the graph.
+          places: decimal places scores are compared in.
+        """
+        graph, reviewers, products = self.make_graph(0, dtype)
+        expected, e_reviewers, e_products = self.make_graph(0, np.float64)
+        for _ in range(5):
+            graph.update()
+            self.update_each_node(expected, e_reviewers, e_products)
+            self.assert_same_scores(
+                (reviewers, products), (e_reviewers, e_products), places)
+
+    def test_update(self):
+        """Test updated scores are as same as updating each node.
+
+        Scores are compared in the precision of float32 the graph uses.
+        """
+        self.check_update(np.float32, 5)
+
+    def test_update_float64(self):
+        """Test updated scores with float64 are as same as updating each node.
+        """
+        self.check_update(np.float64, 7)
+
+    def test_update_after_setting_values(self):
+        """Test values set outside of update are recomputed by the next update.
+
+        The graph converges first so that no inputs of nodes change in
+        updates, and thus only the values set outside must be updated.
+        It uses float64 since scores in float32 may keep oscillating by the
+        last bit instead of converging.
+        """
+        graph, reviewers, products = self.make_graph(0, np.float64)
+        for _ in range(1000):
+            if graph.update() == 0:
+                break
+        else:
+            self.fail("the graph didn't converge")
+        summary = products[0].summary.score
+        score = reviewers[0].anomalous_score
+
+        products[0].summary = summary + 0.5
+        self.assertAlmostEqual(graph.update(), 0.5, places=5)
+        self.assertAlmostEqual(products[0].summary.score, summary, places=5)
+
+        # Updating the reviewer itself must not change its score any more.
+        reviewers[0].anomalous_score = score + 0.5
+        graph.update()
+        self.assertAlmostEqual(
+            reviewers[0].update_anomalous_score(), 0, places=5)
+
+    def test_update_without_deviations(self):
+        """Test reviewers of which reviews equal summaries aren't changed.
+
+        Anomalous scores of such reviewers are 0, which reads as the default
+        score, and thus the differences must be 0 as updating each node.
+        Updating each node is checked in float64 since summaries rounded into
+        float32 differ from the reviews.
+        """
+        for dtype in (np.float32, np.float64):
+            graph = bipartite.BipartiteGraph(dtype=dtype)
+            reviewers = [
+                graph.new_reviewer("reviewer-{0}".format(i)) for i in range(2)]
+            products = [
+                graph.new_product("product-{0}".format(i)) for i in range(2)]
+            graph.add_review(reviewers[0], products[0], 0.2)
+            graph.add_review(reviewers[1], products[1], 0.8)
+            for _ in range(3):
+                self.assertEqual(graph.update(), 0)
+            for r in reviewers:
+                self.assertAlmostEqual(r.anomalous_score, 0.5)
+
+        for r in reviewers:
+            self.assertEqual(r.update_anomalous_score(), 0)
+
+    def test_update_with_tolerance(self):
+        """Test nodes aren't updated when changes are smaller than tolerance.
+        """
+        graph, reviewers, products = self.make_graph(1)
+        graph.update()
+        scores = [r.anomalous_score for r in reviewers]
+        summaries = [p.summary.score for p in products]
+
+        self.assertEqual(graph.update(), 0)
+        self.assertEqual([r.anomalous_score for r in reviewers], scores)
+        self.assertEqual([p.summary.score for p in products], summaries)
+
 
 class TestWeightGenerator(unittest.TestCase):
     """Test case for _weight_generator function.
@@ -387,10 +660,11 @@ class TestWeightGenerator(unittest.TestCase):
         reviewers = [
             self.graph.new_reviewer("reviewer-{0}".format(i)) for i in range(10)
         ]
-        w = self.graph._weight_generator(reviewers)
+        weights, w = self.graph._weight_generator(reviewers)
 
-        for r in reviewers:
+        for r, v in zip(reviewers, weights):
             self.assertEqual(w(r.anomalous_score), 1)
+            self.assertEqual(v, 1)
 
     def test_with_random_reviewers(self):
         """Test with random reviewers.
@@ -399,15 +673,32 @@ class TestWeightGenerator(unittest.TestCase):
             self.graph.new_reviewer("reviewer-{0}".format(i), random.random())
             for i in range(10)
         ]
-        w = self.graph._weight_generator(reviewers)
+        weights, w = self.graph._weight_generator(reviewers)
 
         scores = [r.anomalous_score for r in reviewers]
         mu = np.average(scores)
         sigma = np.std(scores)
 
-        for r in reviewers:
+        for r, v in zip(reviewers, weights):
             exp = np.exp(self.alpha * (r.anomalous_score - mu) / sigma)
             self.assertAlmostEqual(w(r.anomalous_score), 1. / (1. + exp))
+            self.assertAlmostEqual(v, 1. / (1. + exp))
+
+    def test_with_integer_scores(self):
+        """Test weights of reviewers who have integer anomalous scores.
+        """
+        reviewers = [
+            self.graph.new_reviewer("reviewer-{0}".format(i), i + 1)
+            for i in range(3)
+        ]
+        weights, w = self.graph._weight_generator(reviewers)
+
+        self.assertEqual(weights.dtype, np.float64)
+        sigma = np.std([1, 2, 3])
+        for r, v in zip(reviewers, weights):
+            exp = np.exp(self.alpha * (r.anomalous_score - 2) / sigma)
+            self.assertAlmostEqual(w(r.anomalous_score), 1. / (1. + exp))
+            self.assertAlmostEqual(v, 1. / (1. + exp))
 
 
 if __name__ == "__main__":
@@ -25,6 +25,7 @@ import random
 import unittest
 from ria import credibility
 from ria import bipartite
+from tests._graph_fixtures import SampleGraphTestCase
 
 
 class TestUniformCredibility(unittest.TestCase):
@@ -45,7 +46,7 @@ class TestUniformCredibility(unittest.TestCase):
             self.assertEqual(c(p), 1)
 
 
-class TestGraphBasedCredibility(unittest.TestCase):
+class TestGraphBasedCredibility(SampleGraphTestCase):
     """Test case for GraphBasedCredibility.
 
     This test case uses the following bipartite graph.
@@ -68,20 +69,13 @@ class TestGraphBasedCredibility(unittest.TestCase):
 
     """
 
+    graph_cls = bipartite.BipartiteGraph
+    ratings = (0.3, 0.3)
+
     def setUp(self):
-        """Set up a sample graph.
+        """Set up a credibility of the sample graph.
         """
-        self.graph = bipartite.BipartiteGraph()
-        self.reviewers = [
-            self.graph.new_reviewer("reviewer-{0}".format(i)) for i in range(2)
-        ]
-        self.products = [
-            self.graph.new_product("product-{0}".format(i)) for i in range(3)
-        ]
-        for i, r in enumerate(self.reviewers):
-            for j in range(i, len(self.products)):
-                self.graph.add_review(r, self.products[j], 0.3)
-
+        super(TestGraphBasedCredibility, self).setUp()
         self.credibility = credibility.GraphBasedCredibility(self.graph)
 
     def test_call(self):
@@ -97,6 +91,17 @@ class TestGraphBasedCredibility(unittest.TestCase):
             set(self.credibility.reviewers(self.products[2])),
             set(self.reviewers))
 
+    def test_reviewer_indices(self):
+        """Test reviewer_indices.
+        """
+        self.assertEqual(
+            sorted(self.credibility.reviewer_indices(self.products[0])), [0])
+        self.assertEqual(
+            sorted(self.credibility.reviewer_indices(self.products[2])), [0, 1])
+        indices = self.credibility.reviewer_indices(self.products[0])
+        with self.assertRaises(ValueError):
+            indices[0] = 1
+
     def test_review_score(self):
         """Test review_score.
         """
@@ -160,6 +165,14 @@ class WeightedCredibility(unittest.TestCase):
         self.assertAlmostEqual(
             self.credibility(target), np.log(2) / (sigma2 + 1))
 
+    def test_vector(self):
+        """Test credibilities of all products are computed in float64.
+        """
+        vec = self.credibility.vector()
+        self.assertEqual(vec.dtype, np.float64)
+        for p in self.products:
+            self.assertEqual(self.credibility(p), vec[p._id])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,156 @@
+#
+# kernels_test.py
+#
+# Copyright (c) 2016-2017 Junpei Kawamoto
+#
+# This file is part of rgmining-ria.
+#
+# rgmining-ria is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-ria is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with rgmining-ria. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Unit test for ria._kernels module.
+"""
+# pylint: disable=protected-access
+import unittest
+import numpy as np
+from ria import _kernels
+
+
+class TestKernels(unittest.TestCase):
+    """Test case for CSR kernels.
+
+    This test case uses a CSR array of which rows are
+
+    - row 0: 0.1 (column 0), 0.5 (column 2),
+    - row 1: empty,
+    - row 2: 0.8 (column 1),
+
+    and column weights 1, 0, and 3.
+    """
+
+    def setUp(self):
+        """Set up a sample CSR array.
+        """
+        self.indptr = _kernels.indptr(np.array([0, 0, 2], dtype=np.int32), 3)
+        self.indices = np.array([0, 2, 1], dtype=np.int32)
+        self.values = np.array([0.1, 0.5, 0.8], dtype=np.float32)
+        self.weights = np.array([1, 0, 3], dtype=np.float32)
+        self.impls = [(
+            _kernels._np_weighted_mean, _kernels._np_weighted_deviation,
+            _kernels._np_mean_deviation)]
+        if _kernels._ckernels:
+            self.impls.append((
+                _kernels._ckernels.weighted_mean,
+                _kernels._ckernels.weighted_deviation,
+                _kernels._ckernels.mean_deviation))
+        if _kernels.numba:
+            self.impls.append((
+                _kernels._jit_weighted_mean, _kernels._jit_weighted_deviation,
+                _kernels._jit_mean_deviation))
+
+    def test_indptr(self):
+        """Test computing index pointers.
+        """
+        self.assertEqual(list(self.indptr), [0, 2, 2, 3])
+
+    def test_segment_sum(self):
+        """Test sums of rows.
+        """
+        res = _kernels.segment_sum(self.values, self.indptr)
+        for v, expect in zip(res, [0.6, 0, 0.8]):
+            self.assertAlmostEqual(v, expect, places=6)
+
+    def test_segment_any(self):
+        """Test checking rows have true elements.
+        """
+        res = _kernels.segment_any(np.array([False, True, False]), self.indptr)
+        self.assertEqual(list(res), [True, False, False])
+
+    def test_select_rows(self):
+        """Test selecting rows.
+        """
+        indptr, pos = _kernels.select_rows(self.indptr, np.array([0, 2]))
+        self.assertEqual(list(indptr), [0, 2, 3])
+        self.assertEqual(list(self.values[pos]), list(self.values))
+
+        indptr, pos = _kernels.select_rows(self.indptr, np.array([1, 2]))
+        self.assertEqual(list(indptr), [0, 0, 1])
+        self.assertEqual(list(pos), [2])
+
+    def test_weighted_mean(self):
+        """Test weighted averages of rows.
+
+        Row 2 has only a zero-weighted element, and thus the simple average
+        is used.
+        """
+        for weighted_mean, _, _ in self.impls:
+            res = weighted_mean(
+                self.indptr, self.indices, self.values, self.weights)
+            for v, expect in zip(res, [(0.1 + 0.5 * 3) / 4, 0, 0.8]):
+                self.assertAlmostEqual(v, expect, places=6)
+
+    def test_weighted_deviation(self):
+        """Test weighted average deviations of rows.
+        """
+        centers = np.array([0.2, 0.5, 0.1], dtype=np.float32)
+        for _, weighted_deviation, _ in self.impls:
+            res = weighted_deviation(
+                self.indptr, self.indices, self.values, centers, self.weights)
+            for v, expect in zip(res, [(0.1 + 0.4 * 3) / 4, 0, 0.3]):
+                self.assertAlmostEqual(v, expect, places=6)
+
+    def test_mean_deviation(self):
+        """Test average deviations of rows.
+        """
+        centers = np.array([0.2, 0.5, 0.1], dtype=np.float32)
+        for _, _, mean_deviation in self.impls:
+            res = mean_deviation(
+                self.indptr, self.indices, self.values, centers)
+            for v, expect in zip(res, [(0.1 + 0.4) / 2, 0, 0.3]):
+                self.assertAlmostEqual(v, expect, places=6)
+
+    def test_sigmoid_weights(self):
+        """Test weights of anomalous scores.
+
+        Large scores must give 0 without overflows.
+        """
+        scores = np.array([0.1, 0.5, 1000], dtype=np.float32)
+        impls = [_kernels._np_sigmoid_weights]
+        if _kernels._ckernels:
+            impls.append(_kernels._ckernels.sigmoid_weights)
+        if _kernels.numba:
+            def jit_sigmoid_weights(scores, mean, sigma, alpha):
+                """Call the Numba implementation with a new result array.
+                """
+                return _kernels._jit_sigmoid_weights(
+                    scores, mean, sigma, alpha, np.empty_like(scores))
+            impls.append(jit_sigmoid_weights)
+        for sigmoid_weights in impls:
+            res = sigmoid_weights(
+                scores, np.float32(0.3), np.float32(0.2), np.float32(2))
+            self.assertAlmostEqual(res[0], 1 / (1 + np.exp(-2)), places=6)
+            self.assertAlmostEqual(res[1], 1 / (1 + np.exp(2)), places=6)
+            self.assertEqual(res[2], 0)
+
+    def test_sigmoid_weights_with_integers(self):
+        """Test weights of integer anomalous scores are computed as floats.
+        """
+        res = _kernels.sigmoid_weights(np.array([1, 2, 3]), 2., 1., 1.)
+        self.assertEqual(res.dtype, np.float64)
+        expects = [1 / (1 + np.exp(-1)), 0.5, 1 / (1 + np.exp(1))]
+        for v, expect in zip(res, expects):
+            self.assertAlmostEqual(v, expect)
+
+
+if __name__ == "__main__":
+    unittest.main()
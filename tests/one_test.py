@@ -22,9 +22,10 @@
 """
 import unittest
 from ria import one
+from tests._graph_fixtures import SampleGraphTestCase
 
 
-class TestBipartiteGraph(unittest.TestCase):
+class TestBipartiteGraph(SampleGraphTestCase):
     """Test case for one.BipartiteGraph.
 
     This test case uses the following sample graph.
@@ -47,23 +48,27 @@ class TestBipartiteGraph(unittest.TestCase):
 
     """
 
-    def setUp(self):
-        """Set up for tests.
-        """
-        self.graph = one.BipartiteGraph()
-        self.reviewers = [
-            self.graph.new_reviewer("reviewer-{0}".format(i)) for i in range(2)]
-        self.products = [
-            self.graph.new_product("product-{0}".format(i)) for i in range(3)]
-        for i, r in enumerate(self.reviewers):
-            for j in range(i, len(self.products)):
-                self.graph.add_review(
-                    r, self.products[j], 0.1 if i == 0 else 0.8)
+    graph_cls = one.BipartiteGraph
 
     def test_update(self):
         """Test update only works once.
         """
         self.graph.update()
+        scores = [r.anomalous_score for r in self.reviewers]
+        self.assertEqual(self.graph.update(), 0)
+        self.assertEqual(self.graph.update(), 0)
+        self.assertEqual([r.anomalous_score for r in self.reviewers], scores)
+
+    def test_update_after_reset(self):
+        """Test update works again after the updated flag is reset.
+        """
+        self.assertNotEqual(self.graph.update(), 0)
+        self.assertTrue(self.graph.updated)
+        self.assertEqual(self.graph.update(), 0)
+
+        self.graph.updated = False
+        self.assertNotEqual(self.graph.update(), 0)
+        self.assertTrue(self.graph.updated)
         self.assertEqual(self.graph.update(), 0)
 
 
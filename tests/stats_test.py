@@ -0,0 +1,53 @@
+#
+# stats_test.py
+#
+# Copyright (c) 2016-2017 Junpei Kawamoto
+#
+# This file is part of rgmining-ria.
+#
+# rgmining-ria is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-ria is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with rgmining-ria. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Unit test for ria._stats module.
+"""
+import random
+import unittest
+import numpy as np
+from ria import _stats
+
+
+class TestMeanStd(unittest.TestCase):
+    """Test case for mean_std function.
+    """
+
+    def test(self):
+        """Test with random numbers; results must be as same as NumPy's.
+        """
+        xs = [random.random() for _ in range(10)]
+        m, s = _stats.mean_std(xs)
+        self.assertAlmostEqual(m, np.mean(xs))
+        self.assertAlmostEqual(s, np.std(xs))
+
+    def test_same_values(self):
+        """Test with same numbers; the standard deviation must be 0.
+        """
+        self.assertEqual(_stats.mean_std([0.1] * 10), (0.1, 0))
+
+    def test_empty(self):
+        """Test with an empty sequence.
+        """
+        self.assertEqual(_stats.mean_std([]), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
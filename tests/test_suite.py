@@ -24,13 +24,23 @@ from __future__ import absolute_import, print_function
 import importlib
 import sys
 import unittest
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+try:
+    from concurrent import futures
+except ImportError:  # pragma: no cover
+    futures = None
 
 
 TESTS = (
     "tests.bipartite_test",
     "tests.bipartite_sum_test",
     "tests.credibility_test",
+    "tests.kernels_test",
     "tests.one_test",
+    "tests.stats_test",
 )
 """Collection of test modules."""
 
@@ -47,19 +57,66 @@ def suite():
     return res
 
 
+def _run_module(name):
+    """Run tests in a module.
+
+    Args:
+      name: name of the test module.
+
+    Returns:
+      a tuple of whether all tests succeeded and the output of the runner.
+    """
+    mod = importlib.import_module(name)
+    stream = StringIO()
+    res = unittest.TextTestRunner(stream=stream, verbosity=2).run(
+        unittest.TestLoader().loadTestsFromModule(mod))
+    return res.wasSuccessful(), stream.getvalue()
+
+
+def _shutdown(executor):
+    """Shut down an executor without running pending tests.
+
+    Args:
+      executor: the executor to be shut down.
+    """
+    try:
+        executor.shutdown(wait=False, cancel_futures=True)
+    except TypeError:  # pragma: no cover
+        # cancel_futures is available from Python 3.9.
+        executor.shutdown(wait=False)
+
+
 def main():
     """The main function.
 
+    Test modules run in parallel processes, and their outputs are printed in
+    the order of :data:`TESTS`. If concurrent.futures isn't available,
+    they run in this process.
+
     Returns:
       Status code.
     """
+    if futures is None:  # pragma: no cover
+        try:
+            res = unittest.TextTestRunner(verbosity=2).run(suite())
+        except KeyboardInterrupt:
+            print("Test canceled.")
+            return -1
+        else:
+            return 0 if res.wasSuccessful() else 1
+
+    executor = futures.ProcessPoolExecutor()
     try:
-        res = unittest.TextTestRunner(verbosity=2).run(suite())
+        results = list(executor.map(_run_module, TESTS))
     except KeyboardInterrupt:
         print("Test canceled.")
+        _shutdown(executor)
         return -1
-    else:
-        return 0 if res.wasSuccessful() else 1
+    executor.shutdown()
+
+    for _, output in results:
+        sys.stderr.write(output)
+    return 0 if all(success for success, _ in results) else 1
 
 
 if __name__ == "__main__":